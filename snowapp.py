@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import snowflake.connector
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import bisect
+import io
+import os
 import re
+import hashlib
 import logging
-import traceback
-from matplotlib import pyplot as plt
+import queue
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -71,147 +81,331 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ========== SNOWFLAKE FUNCTIONS ==========
-def get_snowflake_connection(user, password, account):
+# Metadata rarely changes while the app is open, but Streamlit reruns the
+# whole script on every widget interaction, so cache lookups for a while.
+METADATA_CACHE_TTL = 300
+# Upper bound on concurrent queries for per-KPI / per-test-case fan-out
+QUERY_WORKERS = 8
+
+# Connections held per credential set; sized to cover the query fan-out
+POOL_SIZE = 8
+# How long to wait for a free pooled connection before giving up (seconds)
+POOL_TIMEOUT = 120
+# Idle connections older than this are pinged before being handed out (seconds)
+POOL_PING_AFTER = 60
+# Snowflake error raised when a session's auth token has expired
+SESSION_EXPIRED_ERRNO = 390114
+# Snowflake error for an object that doesn't exist or isn't authorized
+OBJECT_NOT_FOUND_ERRNO = 2003
+
+class SnowflakePool:
+    """Bounded pool of Snowflake connections sharing one set of credentials.
+
+    Connections are opened lazily, up to ``max_size``, and handed out with
+    ``with pool.acquire() as conn:``. A connection that has sat idle for a
+    while is pinged first and transparently replaced if it has gone stale.
+    """
+    
+    def __init__(self, user, password, account, max_size=POOL_SIZE):
+        self.user = user
+        self.account = account
+        self.max_size = max_size
+        self._connect_args = {
+            'user': user,
+            'password': password,
+            'account': account,
+            'authenticator': 'snowflake',
+            # Server-side binding keeps query text stable across calls, so
+            # Snowflake can reuse compiled plans and cached results
+            'paramstyle': 'qmark',
+            # Heartbeat idle sessions so pooled connections don't expire
+            # between reruns and force a fresh login
+            'client_session_keep_alive': True,
+            'login_timeout': 30,
+            'network_timeout': 60,
+            # Parallel download of large result chunks
+            'client_prefetch_threads': 4,
+            # Lets admins attribute warehouse usage to the app in QUERY_HISTORY
+            'session_parameters': {'QUERY_TAG': 'DeploySure'}
+        }
+        # LIFO so the warmest connection is reused first; empty slots are None
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        for _ in range(max_size):
+            self._idle.put((None, 0.0))
+    
+    @property
+    def key(self):
+        """Hashable fingerprint used to key caches instead of the pool itself."""
+        return f"{self.account}|{self.user}"
+    
+    def _connect(self):
+        return snowflake.connector.connect(**self._connect_args)
+    
+    @staticmethod
+    def _is_alive(conn):
+        if conn.is_closed():
+            return False
+        try:
+            conn.cursor().execute("SELECT 1")
+            return True
+        except ProgrammingError as e:
+            if e.errno == SESSION_EXPIRED_ERRNO:
+                logging.info("Snowflake session expired, reconnecting")
+            else:
+                logging.warning(f"Discarding stale Snowflake connection: {str(e)}")
+            return False
+        except Exception as e:
+            logging.warning(f"Discarding stale Snowflake connection: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception as e:
+            logging.warning(f"Error closing Snowflake connection: {str(e)}")
+    
+    @contextmanager
+    def acquire(self):
+        conn, returned_at = self._idle.get(timeout=POOL_TIMEOUT)
+        try:
+            if conn is not None and time.monotonic() - returned_at > POOL_PING_AFTER:
+                if not self._is_alive(conn):
+                    self._discard(conn)
+                    conn = None
+            if conn is None:
+                conn = self._connect()
+            yield conn
+        finally:
+            self._idle.put((conn, time.monotonic()))
+    
+    def close(self):
+        """Close the idle sessions; the pool stays usable and reconnects on demand."""
+        drained = []
+        while True:
+            try:
+                drained.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for conn, _ in drained:
+            if conn is not None:
+                self._discard(conn)
+            # Keep the slot, or later acquires would wait on a shrunken pool
+            self._idle.put((None, 0.0))
+
+@st.cache_resource(show_spinner=False)
+def _open_snowflake_pool(user, password, account):
+    pool = SnowflakePool(user, password, account)
+    # Open the first connection now so bad credentials fail at login
+    with pool.acquire():
+        pass
+    return pool
+
+def get_snowflake_pool(user, password, account):
     try:
-        conn = snowflake.connector.connect(
-            user=user,
-            password=password,
-            account=account,
-            authenticator='snowflake'
-        )
+        pool = _open_snowflake_pool(user, password, account)
         logging.info("Successfully connected to Snowflake.")
-        return conn, "✅ Successfully connected!"
+        return pool, "✅ Successfully connected!"
     except Exception as e:
         logging.error(f"Connection failed: {str(e)}")
         return None, f"❌ Connection failed: {str(e)}"
 
-def get_databases(conn):
-    if not conn:
+# INFORMATION_SCHEMA splits out length/precision; rebuild the full type so
+# e.g. VARCHAR(10) vs VARCHAR(20) or TIMESTAMP_NTZ(9) vs TIMESTAMP_NTZ(3)
+# still shows up as a type change. Each part is COALESCEd so one NULL
+# attribute can't turn the whole type NULL
+_COLUMN_TYPE_SQL = """COALESCE(DATA_TYPE, '') || CASE
+    WHEN CHARACTER_MAXIMUM_LENGTH IS NOT NULL THEN '(' || CHARACTER_MAXIMUM_LENGTH || ')'
+    WHEN NUMERIC_PRECISION IS NOT NULL
+        THEN '(' || NUMERIC_PRECISION || COALESCE(',' || NUMERIC_SCALE, '') || ')'
+    WHEN DATETIME_PRECISION IS NOT NULL THEN '(' || DATETIME_PRECISION || ')'
+    ELSE ''
+END"""
+
+# Names typed by the user that end up in DDL, where they can't be bound
+_UNQUOTED_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*$')
+
+def _quote_identifier(*parts):
+    """Quote an object name for statements that don't accept bind values.
+
+    Parts come from Snowflake's own listings, so they are quoted exactly as
+    stored rather than interpolated raw.
+    """
+    return ".".join('"' + part.replace('"', '""') + '"' for part in parts)
+
+@st.cache_data(ttl=METADATA_CACHE_TTL, show_spinner=False)
+def _fetch_metadata(_pool, pool_key, query, params=None):
+    with _pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+def _fetch_dataframe(cursor, columns=None):
+    """Read the cursor's result as a DataFrame straight from its Arrow batches.
+
+    Falls back to ``fetchall`` for results the connector can't hand out as
+    Arrow (e.g. SHOW/DESCRIBE output). ``columns`` renames the result columns.
+    """
+    columns = columns or [desc[0] for desc in cursor.description]
+    try:
+        batches = list(cursor.fetch_pandas_batches())
+    except NotSupportedError:
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+    if not batches:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+    df.columns = columns
+    return df
+
+def _describe_table(pool, database, schema, table):
+    # DESC is answered from catalog metadata, so no warehouse has to spin up
+    # the way an INFORMATION_SCHEMA.COLUMNS query would; rows are
+    # (name, type, kind, ...)
+    rows = _fetch_metadata(pool, pool.key, f"DESC TABLE {_quote_identifier(database, schema, table)}")
+    return [row for row in rows if row[2] == 'COLUMN']
+
+def get_databases(pool):
+    if not pool:
         return []
     try:
-        cursor = conn.cursor()
-        cursor.execute("SHOW DATABASES")
-        return [row[1] for row in cursor.fetchall()]
+        rows = _fetch_metadata(pool, pool.key, "SHOW DATABASES")
+        return [row[1] for row in rows]
     except Exception as e:
         logging.error(f"Error getting databases: {str(e)}")
         return []
 
-def get_schemas(conn, database):
-    if not conn or not database:
+def get_schemas(pool, database):
+    if not pool or not database:
         return []
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"SHOW SCHEMAS IN DATABASE {database}")
-        return [row[1] for row in cursor.fetchall()]
+        rows = _fetch_metadata(pool, pool.key, f"SHOW SCHEMAS IN DATABASE {_quote_identifier(database)}")
+        return [row[1] for row in rows]
     except Exception as e:
         logging.error(f"Error getting schemas: {str(e)}")
         return []
 
-def get_tables(conn, database, schema):
-    if not conn or not database or not schema:
+def get_tables(pool, database, schema):
+    if not pool or not database or not schema:
         return []
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"SHOW TABLES IN SCHEMA {database}.{schema}")
-        tables = [row[1] for row in cursor.fetchall()]
-        return [t for t in tables if t.upper() not in ('TEST_CASES', 'ORDER_KPIS')]
+        # Drop the app's own bookkeeping tables server-side; ->> pipes the
+        # SHOW output straight into the filter in the same round trip
+        rows = _fetch_metadata(pool, pool.key, f"""
+            SHOW TABLES IN SCHEMA {_quote_identifier(database, schema)}
+            ->> SELECT "name" FROM $1 WHERE UPPER("name") NOT IN ('TEST_CASES', 'ORDER_KPIS')
+        """)
+        return [row[0] for row in rows]
     except Exception as e:
         logging.error(f"Error getting tables: {str(e)}")
         return []
 
-def get_columns_for_table(conn, database, schema, table):
-    if not conn or not database or not schema or not table:
+def get_columns_for_table(pool, database, schema, table):
+    if not pool or not database or not schema or not table:
         return []
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"""
-            SELECT COLUMN_NAME
-            FROM {database}.INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{table}'
-            ORDER BY ORDINAL_POSITION
-        """)
-        return [row[0] for row in cursor.fetchall()]
+        return [row[0] for row in _describe_table(pool, database, schema, table)]
     except Exception as e:
         logging.error(f"Error getting columns: {str(e)}")
         return []
 
-def _get_column_details_for_dq(conn, database, schema, table):
-    if not conn or not database or not schema or not table:
+def _get_column_details_for_dq(pool, database, schema, table):
+    if not pool or not database or not schema or not table:
         return []
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"""
-            SELECT COLUMN_NAME, DATA_TYPE
-            FROM {database}.INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{table}'
-            ORDER BY ORDINAL_POSITION
-        """)
-        return [{'name': row[0], 'type': row[1].upper()} for row in cursor.fetchall()]
+        return [{'name': row[0], 'type': row[1].upper()} for row in _describe_table(pool, database, schema, table)]
     except Exception as e:
         logging.error(f"Error getting column details: {str(e)}")
         return []
 
+# Checked in order; a type lands in the first bucket with a matching marker
+_TYPE_BUCKETS = (
+    ('numeric', ("NUMBER", "INT", "FLOAT", "DOUBLE")),
+    ('date', ("DATE", "TIMESTAMP")),
+    ('string', ("VARCHAR", "TEXT", "STRING")),
+)
+
+@lru_cache(maxsize=None)
+def _type_bucket(col_type):
+    # Tables repeat a handful of distinct types, so each is only scanned once
+    return next(
+        (bucket for bucket, markers in _TYPE_BUCKETS if any(m in col_type for m in markers)),
+        None
+    )
+
 def _categorize_columns_by_type(column_details_list):
-    numeric_cols, date_cols, string_cols, all_cols = [], [], [], []
+    all_cols = [col['name'] for col in column_details_list]
+    buckets = {bucket: [] for bucket, _ in _TYPE_BUCKETS}
     for col in column_details_list:
-        col_name, col_type = col['name'], col['type']
-        all_cols.append(col_name)
-        if any(t in col_type for t in ["NUMBER", "INT", "FLOAT", "DOUBLE"]):
-            numeric_cols.append(col_name)
-        elif any(t in col_type for t in ["DATE", "TIMESTAMP"]):
-            date_cols.append(col_name)
-        elif any(t in col_type for t in ["VARCHAR", "TEXT", "STRING"]):
-            string_cols.append(col_name)
-    return all_cols, numeric_cols, date_cols, string_cols
-
-def clone_schema(conn, source_db, source_schema, target_schema):
-    if not conn:
+        bucket = _type_bucket(col['type'])
+        if bucket:
+            buckets[bucket].append(col['name'])
+    return all_cols, buckets['numeric'], buckets['date'], buckets['string']
+
+def clone_schema(pool, source_db, source_schema, target_schema):
+    if not pool:
         return False, "❌ Not connected to Snowflake.", pd.DataFrame()
     if not source_db or not source_schema or not target_schema:
         return False, "⚠️ Please provide all required fields.", pd.DataFrame()
+    if not _UNQUOTED_IDENTIFIER_RE.match(target_schema):
+        return False, "⚠️ Target schema must be a plain identifier (letters, digits, _ or $).", pd.DataFrame()
     
-    cursor = conn.cursor()
     try:
-        cursor.execute(f"SHOW SCHEMAS LIKE '{source_schema}' IN DATABASE {source_db}")
-        if not cursor.fetchall():
-            return False, f"❌ Source schema doesn't exist", pd.DataFrame()
-        
-        clone_sql = f"CREATE OR REPLACE SCHEMA {source_db}.{target_schema} CLONE {source_db}.{source_schema}"
-        cursor.execute(clone_sql)
+        with pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(*) FROM IDENTIFIER(?) WHERE SCHEMA_NAME = ?",
+                (_quote_identifier(source_db, "INFORMATION_SCHEMA", "SCHEMATA"), source_schema)
+            )
+            if cursor.fetchone()[0] == 0:
+                return False, f"❌ Source schema doesn't exist", pd.DataFrame()
         
-        cursor.execute(f"SHOW TABLES IN SCHEMA {source_db}.{source_schema}")
-        source_tables = [row[1] for row in cursor.fetchall()]
+            clone_sql = (
+                f"CREATE OR REPLACE SCHEMA {_quote_identifier(source_db)}.{target_schema} "
+                f"CLONE {_quote_identifier(source_db, source_schema)}"
+            )
+            cursor.execute(clone_sql)
+            # The new (or replaced) schema must show up in the cached listings
+            _fetch_metadata.clear()
         
-        cursor.execute(f"SHOW TABLES IN SCHEMA {source_db}.{target_schema}")
-        clone_tables = [row[1] for row in cursor.fetchall()]
+            # The CLONE DDL leaves the target unquoted, so Snowflake stores it
+            # upper-cased; BASE TABLE matches what SHOW TABLES lists (no views
+            # or materialized views)
+            clone_schema_name = target_schema.upper()
+            cursor.execute("""
+                SELECT TABLE_SCHEMA, COUNT(*) FROM IDENTIFIER(?)
+                WHERE TABLE_SCHEMA IN (?, ?) AND TABLE_TYPE = 'BASE TABLE'
+                GROUP BY TABLE_SCHEMA
+            """, (_quote_identifier(source_db, "INFORMATION_SCHEMA", "TABLES"), source_schema, clone_schema_name))
+            table_counts = dict(cursor.fetchall())
+            source_tables = table_counts.get(source_schema, 0)
+            clone_tables = table_counts.get(clone_schema_name, 0)
         
-        df = pd.DataFrame({
-            'Database': [source_db],
-            'Source Schema': [source_schema],
-            'Clone Schema': [target_schema],
-            'Source Tables': [len(source_tables)],
-            'Cloned Tables': [len(clone_tables)],
-            'Status': ['✅ Success' if len(source_tables) == len(clone_tables) else '⚠️ Partial']
-        })
+            df = pd.DataFrame({
+                'Database': [source_db],
+                'Source Schema': [source_schema],
+                'Clone Schema': [target_schema],
+                'Source Tables': [source_tables],
+                'Cloned Tables': [clone_tables],
+                'Status': ['✅ Success' if source_tables == clone_tables else '⚠️ Partial']
+            })
         
-        return True, f"✅ Successfully Mirrored Schema", df
+            return True, f"✅ Successfully Mirrored Schema", df
     except Exception as e:
         logging.error(f"Clone failed: {str(e)}")
         return False, f"❌ Clone failed: {str(e)}", pd.DataFrame()
 
-def compare_table_differences(conn, db_name, source_schema, clone_schema):
-    if not conn:
+def compare_table_differences(pool, db_name, source_schema, clone_schema):
+    if not pool:
         return pd.DataFrame()
     
-    cursor = conn.cursor()
-    query = f"""
+    query = """
     WITH source_tables AS (
-        SELECT table_name FROM {db_name}.information_schema.tables
-        WHERE table_schema = '{source_schema}'
+        SELECT table_name FROM IDENTIFIER(?)
+        WHERE table_schema = ?
     ),
     clone_tables AS (
-        SELECT table_name FROM {db_name}.information_schema.tables
-        WHERE table_schema = '{clone_schema}'
+        SELECT table_name FROM IDENTIFIER(?)
+        WHERE table_schema = ?
     )
     SELECT
         COALESCE(s.table_name, c.table_name) AS table_name,
@@ -225,170 +419,299 @@ def compare_table_differences(conn, db_name, source_schema, clone_schema):
     WHERE s.table_name IS NULL OR c.table_name IS NULL
     ORDER BY difference, table_name
     """
+    tables_view = _quote_identifier(db_name, "INFORMATION_SCHEMA", "TABLES")
     
     try:
-        cursor.execute(query)
-        return pd.DataFrame(cursor.fetchall(), columns=['Table', 'Difference'])
+        with pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (tables_view, source_schema, tables_view, clone_schema))
+            return _fetch_dataframe(cursor, columns=['Table', 'Difference'])
     except Exception as e:
         logging.error(f"Error comparing tables: {str(e)}")
         return pd.DataFrame()
 
-def compare_column_differences(conn, db_name, source_schema, clone_schema):
-    if not conn:
+def compare_column_differences(pool, db_name, source_schema, clone_schema):
+    if not pool:
         return pd.DataFrame(), pd.DataFrame()
     
-    cursor = conn.cursor()
+    query = f"""
+    WITH source_columns AS (
+        SELECT table_name, column_name, {_COLUMN_TYPE_SQL} AS data_type
+        FROM IDENTIFIER(?)
+        WHERE table_schema = ?
+    ),
+    clone_columns AS (
+        SELECT table_name, column_name, {_COLUMN_TYPE_SQL} AS data_type
+        FROM IDENTIFIER(?)
+        WHERE table_schema = ?
+    ),
+    common_tables AS (
+        SELECT DISTINCT s.table_name
+        FROM source_columns s
+        JOIN clone_columns c ON s.table_name = c.table_name
+    )
+    SELECT
+        COALESCE(s.table_name, c.table_name) AS table_name,
+        COALESCE(s.column_name, c.column_name) AS column_name,
+        CASE
+            WHEN s.column_name IS NULL THEN 'Missing in source'
+            WHEN c.column_name IS NULL THEN 'Missing in clone'
+            ELSE 'Type Changed'
+        END AS difference,
+        s.data_type AS source_type,
+        c.data_type AS clone_type
+    FROM source_columns s
+    FULL OUTER JOIN clone_columns c
+        ON s.table_name = c.table_name AND s.column_name = c.column_name
+    WHERE COALESCE(s.table_name, c.table_name) IN (SELECT table_name FROM common_tables)
+        AND (s.column_name IS NULL OR c.column_name IS NULL OR s.data_type IS DISTINCT FROM c.data_type)
+    ORDER BY table_name, column_name
+    """
+    columns_view = _quote_identifier(db_name, "INFORMATION_SCHEMA", "COLUMNS")
+    
     try:
-        cursor.execute(f"""
-            SELECT s.table_name
-            FROM {db_name}.information_schema.tables s
-            JOIN {db_name}.information_schema.tables c ON s.table_name = c.table_name
-            WHERE s.table_schema = '{source_schema}' AND c.table_schema = '{clone_schema}'
-        """)
-        common_tables = [row[0] for row in cursor.fetchall()]
+        with pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (columns_view, source_schema, columns_view, clone_schema))
+            diff = _fetch_dataframe(
+                cursor, columns=['Table', 'Column', 'Difference', 'Source Type', 'Clone Type']
+            )
     except Exception as e:
+        logging.error(f"Error comparing columns: {str(e)}")
         return pd.DataFrame(), pd.DataFrame()
     
-    column_diff_data, datatype_diff_data = [], []
-    
-    for table in common_tables:
-        try:
-            cursor.execute(f"DESCRIBE TABLE {db_name}.{source_schema}.{table}")
-            source_cols = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            cursor.execute(f"DESCRIBE TABLE {db_name}.{clone_schema}.{table}")
-            clone_cols = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            all_columns = set(source_cols.keys()).union(set(clone_cols.keys()))
-            
-            for col in all_columns:
-                if col not in source_cols:
-                    column_diff_data.append({
-                        'Table': table, 'Column': col, 'Difference': 'Missing in source',
-                        'Source Type': None, 'Clone Type': clone_cols.get(col)
-                    })
-                elif col not in clone_cols:
-                    column_diff_data.append({
-                        'Table': table, 'Column': col, 'Difference': 'Missing in clone',
-                        'Source Type': source_cols.get(col), 'Clone Type': None
-                    })
-                elif source_cols[col] != clone_cols[col]:
-                    datatype_diff_data.append({
-                        'Table': table, 'Column': col,
-                        'Source Type': source_cols[col], 'Clone Type': clone_cols[col],
-                        'Difference': 'Type Changed'
-                    })
-        except:
-            continue
-    
-    return pd.DataFrame(column_diff_data), pd.DataFrame(datatype_diff_data)
-
-def get_test_case_tables(conn, database, schema):
-    if not conn or not database or not schema:
-        return ["All"]
-    try:
-        cursor = conn.cursor()
-        cursor.execute(f"""
-            SELECT COUNT(*) FROM {database}.information_schema.tables
-            WHERE table_schema = '{schema}' AND table_name = 'TEST_CASES'
-        """)
-        if cursor.fetchone()[0] == 0:
-            return ["All"]
-        
-        cursor.execute(f"""
-            SELECT DISTINCT TABLE_NAME FROM {database}.{schema}.TEST_CASES
-            WHERE TABLE_NAME IS NOT NULL ORDER BY TABLE_NAME
-        """)
-        return ["All"] + [row[0] for row in cursor.fetchall()]
-    except:
-        return ["All"]
+    type_changed = diff['Difference'] == 'Type Changed'
+    column_diff = diff[~type_changed].reset_index(drop=True)
+    datatype_diff = diff.loc[type_changed, ['Table', 'Column', 'Source Type', 'Clone Type', 'Difference']].reset_index(drop=True)
+    return column_diff, datatype_diff
 
-def get_test_cases(conn, database, schema, table):
-    if not conn or not database or not schema:
-        return []
+def compare_schemas(pool, db_name, source_schema, clone_schema):
+    # The diffs are independent queries; run them side by side on separate
+    # pooled connections (serially if the pool only has one)
+    with ThreadPoolExecutor(max_workers=min(2, pool.max_size)) as executor:
+        table_future = executor.submit(compare_table_differences, pool, db_name, source_schema, clone_schema)
+        column_future = executor.submit(compare_column_differences, pool, db_name, source_schema, clone_schema)
+        col_diff, type_diff = column_future.result()
+        return table_future.result(), col_diff, type_diff
+
+TEST_CASE_COLUMNS = [
+    'TEST_CASE_ID', 'TEST_ABBREVIATION', 'TABLE_NAME',
+    'TEST_DESCRIPTION', 'SQL_CODE', 'EXPECTED_RESULT'
+]
+
+def _read_test_cases(pool, database, schema, table):
+    if not pool or not database or not schema:
+        return pd.DataFrame(columns=TEST_CASE_COLUMNS)
     try:
-        cursor = conn.cursor()
+        test_cases_table = _quote_identifier(database, schema, "TEST_CASES")
         if table == "All":
-            query = f"""
+            query = """
                 SELECT TEST_CASE_ID, TEST_ABBREVIATION, TABLE_NAME,
                        TEST_DESCRIPTION, SQL_CODE, EXPECTED_RESULT
-                FROM {database}.{schema}.TEST_CASES ORDER BY TEST_CASE_ID
+                FROM IDENTIFIER(?) ORDER BY TEST_CASE_ID
             """
+            params = (test_cases_table,)
         else:
-            query = f"""
+            query = """
                 SELECT TEST_CASE_ID, TEST_ABBREVIATION, TABLE_NAME,
                        TEST_DESCRIPTION, SQL_CODE, EXPECTED_RESULT
-                FROM {database}.{schema}.TEST_CASES
-                WHERE TABLE_NAME = '{table}' ORDER BY TEST_CASE_ID
+                FROM IDENTIFIER(?)
+                WHERE TABLE_NAME = ? ORDER BY TEST_CASE_ID
             """
-        cursor.execute(query)
-        return cursor.fetchall()
-    except:
-        return []
+            params = (test_cases_table, table)
+        with pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return _fetch_dataframe(cursor, columns=TEST_CASE_COLUMNS)
+    except ProgrammingError as e:
+        # No TEST_CASES table just means the schema has no cases; no need to
+        # probe INFORMATION_SCHEMA for it first
+        if e.errno != OBJECT_NOT_FOUND_ERRNO:
+            logging.error(f"Error getting test cases: {str(e)}")
+        return pd.DataFrame(columns=TEST_CASE_COLUMNS)
+    except Exception as e:
+        logging.error(f"Error getting test cases: {str(e)}")
+        return pd.DataFrame(columns=TEST_CASE_COLUMNS)
 
-def validate_test_cases(conn, database, schema, test_cases):
-    if not conn or not test_cases:
-        return pd.DataFrame(), "❌ No connection or test cases"
-    
+def load_test_cases(pool, database, schema):
+    # Every category in one round-trip; the tab filters this frame locally
+    return _read_test_cases(pool, database, schema, "All")
+
+def _fetch_one(conn, query, params=None):
     cursor = conn.cursor()
-    results = []
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+def _test_case_result(case, actual=None, error=None):
+    test_id, abbrev, table_name, desc, sql, expected = case
+    expected = str(expected).strip()
+    
+    if error is not None:
+        return {
+            'Test Case': abbrev, 'Category': table_name,
+            'Expected': expected, 'Actual': f"ERROR: {str(error)[:50]}",
+            'Status': "❌ ERROR"
+        }
     
+    # PASS/FAIL is filled in for the whole batch by _apply_test_case_status
+    return {
+        'Test Case': abbrev, 'Category': table_name,
+        'Expected': expected, 'Actual': actual, 'Status': None
+    }
+
+# Relative slack for values with a fractional part, to absorb float rounding
+# in TO_VARCHAR; whole numbers (e.g. row counts) must match exactly
+TEST_CASE_FRACTION_RTOL = Decimal('1e-12')
+
+def _parse_number(value):
+    try:
+        number = Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        return None
+    return number if number.is_finite() else None
+
+def _test_case_values_match(actual, expected):
+    # Numbers compare by value so e.g. "1" matches "1.0"; anything that
+    # doesn't parse as a number on both sides falls back to string equality
+    actual_num, expected_num = _parse_number(actual), _parse_number(expected)
+    if actual_num is None or expected_num is None:
+        return actual == expected
+    if actual_num == expected_num:
+        return True
+    if actual_num == actual_num.to_integral_value() and expected_num == expected_num.to_integral_value():
+        return False
+    return abs(actual_num - expected_num) <= TEST_CASE_FRACTION_RTOL * max(abs(actual_num), abs(expected_num))
+
+def _apply_test_case_status(df):
+    if df.empty:
+        return df
+    pending = df['Status'].isna()
+    matches = [
+        _test_case_values_match(actual, expected)
+        for actual, expected in zip(df.loc[pending, 'Actual'], df.loc[pending, 'Expected'])
+    ]
+    df.loc[pending, 'Status'] = np.where(matches, "✅ PASS", "❌ FAIL")
+    return df
+
+def _run_test_cases_async(conn, test_cases):
+    # Submit every case before waiting on any, so they all run concurrently
+    # in Snowflake; results are then collected in submission order
+    submitted = []
     for case in test_cases:
-        test_id, abbrev, table_name, desc, sql, expected = case
-        expected = str(expected).strip()
-        
+        cursor = conn.cursor()
         try:
-            qualified_sql = re.sub(
-                rf'\b{re.escape(table_name)}\b',
-                f'{database}.{schema}.{table_name}',
-                sql, flags=re.IGNORECASE
-            )
-            cursor.execute(qualified_sql)
+            cursor.execute_async(case[4])
+            submitted.append((case, cursor, None))
+        except Exception as e:
+            submitted.append((case, cursor, e))
+    
+    results = []
+    for case, cursor, error in submitted:
+        try:
+            if error is not None:
+                raise error
+            cursor.get_results_from_sfqid(cursor.sfqid)
             result = cursor.fetchone()
-            actual = str(result[0]) if result else "0"
-            status = "✅ PASS" if actual == expected else "❌ FAIL"
-            
-            results.append({
-                'Test Case': abbrev, 'Category': table_name,
-                'Expected': expected, 'Actual': actual, 'Status': status
-            })
+            results.append(_test_case_result(case, str(result[0]) if result else "0"))
         except Exception as e:
-            results.append({
-                'Test Case': abbrev, 'Category': table_name,
-                'Expected': expected, 'Actual': f"ERROR: {str(e)[:50]}",
-                'Status': "❌ ERROR"
-            })
+            results.append(_test_case_result(case, error=e))
+        finally:
+            cursor.close()
+    return results
+
+def _batch_test_case_query(test_cases):
+    # One row with a scalar subquery per case. Each column keeps its case's own
+    # type, so str() formats it exactly as running the case on its own would;
+    # a case returning several rows or columns fails the batch instead
+    return "SELECT\n" + ",\n".join(
+        f"(\n{case[4].strip().rstrip(';')}\n) AS CASE_{index}"
+        for index, case in enumerate(test_cases)
+    )
+
+def validate_test_cases(pool, database, schema, test_cases):
+    if not pool or not test_cases:
+        return pd.DataFrame(), "❌ No connection or test cases"
+    
+    try:
+        with pool.acquire() as conn:
+            # Resolve the cases' unqualified table names against the target schema
+            # server-side, so each case's SQL text is sent verbatim
+            conn.cursor().execute("USE SCHEMA IDENTIFIER(?)", (_quote_identifier(database, schema),))
+            
+            try:
+                cursor = conn.cursor()
+                cursor.execute(_batch_test_case_query(test_cases))
+                actuals = cursor.fetchone()
+                # A NULL here is either a NULL result ("None") or no row at
+                # all ("0"); only running those cases on their own tells which
+                unresolved = [case for case, actual in zip(test_cases, actuals) if actual is None]
+                reruns = iter(_run_test_cases_async(conn, unresolved))
+                results = [
+                    next(reruns) if actual is None else _test_case_result(case, str(actual))
+                    for case, actual in zip(test_cases, actuals)
+                ]
+            except Exception as e:
+                # One bad case fails the whole batch; rerun individually so the
+                # error is reported against the case that caused it
+                logging.warning(f"Batched test case run failed, running cases individually: {str(e)}")
+                results = _run_test_cases_async(conn, test_cases)
+    except Exception as e:
+        # e.g. the schema was dropped while the cached listing still shows it
+        logging.error(f"Test case validation failed: {str(e)}")
+        return pd.DataFrame(), f"❌ Failed: {str(e)}"
     
-    return pd.DataFrame(results), "✅ Validation completed"
+    return _apply_test_case_status(pd.DataFrame(results)), "✅ Validation completed"
 
-def validate_kpis(conn, database, source_schema, target_schema):
-    if not conn:
+# How long an identical test case run is answered from memory (seconds)
+TEST_RESULT_CACHE_TTL = 600
+
+@st.cache_data(ttl=TEST_RESULT_CACHE_TTL, show_spinner=False)
+def _cached_validate_test_cases(_pool, pool_key, database, schema, test_cases):
+    # test_cases is a tuple of case tuples, so the SQL itself is part of the key
+    return validate_test_cases(_pool, database, schema, list(test_cases))
+
+def _run_kpi_query(conn, kpi_sql):
+    try:
+        return _fetch_one(conn, kpi_sql)[0]
+    except:
+        return "ERROR"
+
+def _run_kpi_queries(pool, database, schema, kpis):
+    with pool.acquire() as conn:
+        # Unqualified names in the KPI SQL (ORDER_DATA and anything else)
+        # resolve against this side's schema, so the SQL is sent verbatim
+        conn.cursor().execute("USE SCHEMA IDENTIFIER(?)", (_quote_identifier(database, schema),))
+        with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, len(kpis))) as executor:
+            return list(executor.map(lambda kpi: _run_kpi_query(conn, kpi[2]), kpis))
+
+def validate_kpis(pool, database, source_schema, target_schema):
+    if not pool:
         return pd.DataFrame(), "❌ Not connected"
     
-    cursor = conn.cursor()
     try:
-        cursor.execute(f"SELECT KPI_ID, KPI_NAME, KPI_VALUE FROM {database}.{source_schema}.ORDER_KPIS")
-        kpis = cursor.fetchall()
+        with pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT KPI_ID, KPI_NAME, KPI_VALUE FROM IDENTIFIER(?)",
+                (_quote_identifier(database, source_schema, "ORDER_KPIS"),)
+            )
+            kpis = cursor.fetchall()
         
         if not kpis:
             return pd.DataFrame(), "⚠️ No KPIs found"
         
+        # Each side needs its own session schema, so each gets its own
+        # pooled connection; both run at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source_future = executor.submit(_run_kpi_queries, pool, database, source_schema, kpis)
+            clone_future = executor.submit(_run_kpi_queries, pool, database, target_schema, kpis)
+            source_vals, clone_vals = source_future.result(), clone_future.result()
+        
         results = []
-        for kpi_id, kpi_name, kpi_sql in kpis:
-            try:
-                source_query = re.sub(r'\bORDER_DATA\b', f'{database}.{source_schema}.ORDER_DATA', kpi_sql, flags=re.IGNORECASE)
-                cursor.execute(source_query)
-                source_val = cursor.fetchone()[0]
-            except:
-                source_val = "ERROR"
-            
-            try:
-                clone_query = re.sub(r'\bORDER_DATA\b', f'{database}.{target_schema}.ORDER_DATA', kpi_sql, flags=re.IGNORECASE)
-                cursor.execute(clone_query)
-                clone_val = cursor.fetchone()[0]
-            except:
-                clone_val = "ERROR"
-            
+        for (kpi_id, kpi_name, kpi_sql), source_val, clone_val in zip(kpis, source_vals, clone_vals):
             if isinstance(source_val, (int, float)) and isinstance(clone_val, (int, float)):
                 diff = float(source_val) - float(clone_val)
                 status = '✅ Match' if diff == 0 else '⚠️ Mismatch'
@@ -405,70 +728,127 @@ def validate_kpis(conn, database, source_schema, target_schema):
     except Exception as e:
         return pd.DataFrame(), f"❌ Failed: {str(e)}"
 
+# Duplicate check methods, fastest first, with their labels in the UI
+DUPLICATE_MODES = {
+    "hash": "Row hashes",
+    "approx": "Approximate (HLL)",
+    "exact": "Exact (GROUP BY)",
+}
+
 class DataQualityValidator:
-    def __init__(self, conn):
-        self.conn = conn
+    def __init__(self, pool):
+        self.pool = pool
     
-    def _execute_query(self, query):
-        cursor = self.conn.cursor()
-        cursor.execute(query)
-        return pd.DataFrame(cursor.fetchall(), columns=[desc[0] for desc in cursor.description])
+    def _fetch_row(self, query, params=None):
+        # The checks are aggregates returning one row; no DataFrame needed
+        with self.pool.acquire() as conn:
+            return _fetch_one(conn, query, params)
     
-    def _run_row_count_check(self, database, schema, table, min_rows):
-        query = f"SELECT COUNT(*) FROM {database}.{schema}.{table}"
-        count = self._execute_query(query).iloc[0, 0]
+    def _metadata_row_count(self, database, schema, table):
+        # SHOW TABLES reports the row count Snowflake keeps in table metadata,
+        # so no warehouse scan is needed. None if the table isn't listed
+        pattern = table.replace("\\", "\\\\").replace("'", "\\'")
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SHOW TABLES LIKE '{pattern}' IN SCHEMA {_quote_identifier(database, schema)}")
+            names = [desc[0] for desc in cursor.description]
+            # LIKE is case-insensitive and treats _ as a wildcard; keep the exact match
+            for row in cursor.fetchall():
+                if row[names.index('name')] == table:
+                    return row[names.index('rows')]
+        return None
+    
+    @staticmethod
+    def _row_count_result(count, min_rows, from_metadata=False):
         status = "✅ Pass" if count >= min_rows else "❌ Fail"
+        source = " (table metadata)" if from_metadata else ""
         return {
             "Check": "Row Count", "Column": "N/A",
             "Expected": f">= {min_rows}", "Actual": count,
-            "Status": status, "Details": f"Rows: {count}"
+            "Status": status, "Details": f"Rows: {count}{source}"
         }
     
-    def _run_duplicate_check(self, database, schema, table):
-        columns = _get_column_details_for_dq(self.conn, database, schema, table)
-        if not columns:
-            return {
-                "Check": "Duplicates", "Column": "All",
-                "Expected": "0", "Actual": "N/A",
-                "Status": "⚠️ N/A", "Details": "No columns"
-            }
-        
-        cols_str = ", ".join([f'"{col["name"]}"' for col in columns])
-        query = f"""
-        SELECT COUNT(*) FROM (
-            SELECT {cols_str} FROM {database}.{schema}.{table}
-            GROUP BY {cols_str} HAVING COUNT(*) > 1
-        )
-        """
-        dup_count = self._execute_query(query).iloc[0, 0]
+    @staticmethod
+    def _exact_duplicate_expression(columns):
+        cols_str = ", ".join(_quote_identifier(col["name"]) for col in columns)
+        return f"""(
+            SELECT COUNT(*) FROM (
+                SELECT {cols_str} FROM IDENTIFIER(?)
+                GROUP BY {cols_str} HAVING COUNT(*) > 1
+            )
+        )"""
+    
+    @staticmethod
+    def _duplicate_result(dup_count, label):
         status = "✅ Pass" if dup_count == 0 else "❌ Fail"
         return {
             "Check": "Duplicates", "Column": "All",
             "Expected": "0", "Actual": dup_count,
-            "Status": status, "Details": f"Duplicates: {dup_count}"
+            "Status": status, "Details": f"{label}: {dup_count}"
         }
     
-    def run_checks(self, database, schema, table, check_row_count, min_rows, check_duplicates):
+    def run_checks(self, database, schema, table, check_row_count, min_rows, check_duplicates,
+                   duplicate_mode="hash", exact_row_count=False):
+        table_name = _quote_identifier(database, schema, table)
+        projections, params = ["COUNT(*)"], []
+        dup_label = None
         results = []
-        total = passed = failed = 0
-        
-        if check_row_count:
-            res = self._run_row_count_check(database, schema, table, min_rows)
-            results.append(res)
-            total += 1
-            if res["Status"] == "✅ Pass":
-                passed += 1
-            else:
-                failed += 1
-        
-        if check_duplicates:
-            res = self._run_duplicate_check(database, schema, table)
-            results.append(res)
-            total += 1
-            if res["Status"] == "✅ Pass":
-                passed += 1
-            else:
-                failed += 1
+        
+        metadata_count = None
+        if check_duplicates or (check_row_count and not exact_row_count):
+            metadata_count = self._metadata_row_count(database, schema, table)
+        
+        if check_duplicates and metadata_count is not None and metadata_count < 2:
+            # Fewer than two rows can't hold a duplicate; skip the scan
+            check_duplicates = False
+            trivial_duplicates = self._duplicate_result(0, f"Trivially deduplicated (row_count={metadata_count})")
+        else:
+            trivial_duplicates = None
+        
+        if check_duplicates and duplicate_mode == "approx":
+            # HyperLogLog estimate of the distinct rows; can undershoot slightly,
+            # hence the clamp at zero
+            projections.append("GREATEST(COUNT(*) - APPROX_COUNT_DISTINCT(HASH(*)), 0)")
+            dup_label = "Duplicate rows (approximate, HLL)"
+        elif check_duplicates and duplicate_mode == "hash":
+            # Extra copies of repeated rows, from one streaming pass over row
+            # hashes; HASH(*) covers every column without looking them up
+            projections.append("COUNT(*) - COUNT(DISTINCT HASH(*))")
+            dup_label = "Duplicate rows"
+        elif check_duplicates:
+            # GROUP BY needs the column list spelled out
+            columns = _get_column_details_for_dq(self.pool, database, schema, table)
+            if columns:
+                projections.append(self._exact_duplicate_expression(columns))
+                params.append(table_name)
+                dup_label = "Duplicate groups"
+        
+        if check_row_count and metadata_count is not None and not exact_row_count and not dup_label:
+            # Nothing else needs a scan, so the metadata count is enough
+            results.append(self._row_count_result(metadata_count, min_rows, from_metadata=True))
+        elif check_row_count or dup_label:
+            # Every enabled check is one column of a single query, so the
+            # table is scanned (and round-tripped to) once
+            params.append(table_name)
+            query = f"SELECT {', '.join(projections)} FROM IDENTIFIER(?)"
+            row = self._fetch_row(query, tuple(params))
+            if check_row_count:
+                results.append(self._row_count_result(row[0], min_rows))
+            if dup_label:
+                results.append(self._duplicate_result(row[1], dup_label))
+        
+        if trivial_duplicates:
+            results.append(trivial_duplicates)
+        if check_duplicates and not dup_label:
+            results.append({
+                "Check": "Duplicates", "Column": "All",
+                "Expected": "0", "Actual": "N/A",
+                "Status": "⚠️ N/A", "Details": "No columns"
+            })
+        
+        total = len(results)
+        passed = sum(res["Status"] == "✅ Pass" for res in results)
+        failed = total - passed
         
         score = (passed / total * 100) if total > 0 else 0
         
@@ -484,13 +864,44 @@ class DataQualityValidator:
         
         return summary, details, score
 
+@st.cache_resource(show_spinner=False)
+def get_validator(_pool, pool_key):
+    # One validator per credential set, shared across reruns like the pool itself
+    return DataQualityValidator(_pool)
+
+# How long identical quality check results are answered from memory (seconds)
+DQ_RESULT_CACHE_TTL = 120
+
+@st.cache_data(ttl=DQ_RESULT_CACHE_TTL, show_spinner=False)
+def _cached_run_checks(_validator, pool_key, database, schema, table, check_row_count, min_rows,
+                       check_duplicates, duplicate_mode, exact_row_count):
+    return _validator.run_checks(
+        database, schema, table, check_row_count, min_rows, check_duplicates, duplicate_mode,
+        exact_row_count
+    )
+
+# Lower bounds of the warning and passed bands, and the class for each band
+SCORE_THRESHOLDS = (50, 80)
+SCORE_CLASSES = ("failed-score", "warning-score", "passed-score")
+
+def score_class(score):
+    """CSS class of the quality-score box; worked out once when the score is stored."""
+    return SCORE_CLASSES[bisect.bisect_right(SCORE_THRESHOLDS, score)]
+
 # ========== SESSION STATE ==========
-if 'conn' not in st.session_state:
-    st.session_state.conn = None
+if 'pool' not in st.session_state:
+    st.session_state.pool = None
 if 'is_logged_in' not in st.session_state:
     st.session_state.is_logged_in = False
 if 'username' not in st.session_state:
     st.session_state.username = ""
+# Results panes check these for None instead of testing key membership
+for _result_key in ('table_diff', 'col_diff', 'type_diff', 'kpi_results',
+                    'test_results', 'dq_summary', 'dq_details', 'dq_score',
+                    'dq_score_class'):
+    st.session_state.setdefault(_result_key, None)
+if 'results_restored' not in st.session_state:
+    st.session_state.results_restored = False
 
 # ========== LOGIN PAGE ==========
 def show_login_page():
@@ -520,10 +931,10 @@ def show_login_page():
             if login_button:
                 if username and password and account:
                     with st.spinner("🔄 Connecting..."):
-                        conn, msg = get_snowflake_connection(username, password, account)
+                        pool, msg = get_snowflake_pool(username, password, account)
                         
-                        if conn:
-                            st.session_state.conn = conn
+                        if pool:
+                            st.session_state.pool = pool
                             st.session_state.is_logged_in = True
                             st.session_state.username = username
                             st.success(msg)
@@ -537,7 +948,504 @@ def show_login_page():
         st.info("💡 **Tip:** Ensure you have proper Snowflake credentials and network access")
 
 # ========== MAIN APP ==========
+# Rows sent to the browser per result table; downloads still get everything
+DISPLAY_PAGE_SIZE = 100
+# Page sizes offered once a result spans more than one page
+DISPLAY_PAGE_SIZES = (100, 500, 1000, 5000)
+# Rows pandas formats per write when encoding a CSV download
+CSV_CHUNK_ROWS = 10_000
+
+@st.cache_resource(show_spinner=False)
+def _polars():
+    # Optional, much faster CSV writer; imported on the first download
+    # rather than on every cold start
+    try:
+        import polars as pl
+    except ImportError:
+        return None
+    return pl
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(df):
+    # Reruns re-render download buttons constantly; encode each result once
+    pl = _polars()
+    if pl is not None:
+        try:
+            return pl.from_pandas(df).write_csv().encode('utf-8')
+        except Exception as e:
+            # e.g. mixed-type object columns polars can't type
+            logging.warning(f"polars CSV export failed, using pandas: {str(e)}")
+    # Encode straight into a byte buffer a chunk at a time, rather than
+    # building the whole CSV as one str and then encoding a copy of it
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8', chunksize=CSV_CHUNK_ROWS)
+    return buf.getvalue()
+
+def _parquet_ready(df):
+    # Parquet needs one type per column; e.g. DQ "Actual" mixes counts and "N/A".
+    # Nulls stay null rather than becoming the strings "None"/"nan"
+    return df.assign(**{
+        col: df[col].map(lambda value: value if pd.isna(value) else str(value))
+        for col in df.columns[df.dtypes == object]
+    })
+
+@st.cache_data(show_spinner=False)
+def _parquet_bytes(df):
+    buf = io.BytesIO()
+    _parquet_ready(df).to_parquet(buf, engine='pyarrow', compression='zstd', index=False)
+    return buf.getvalue()
+
+DOWNLOAD_FORMATS = ("CSV", "Parquet")
+
+def download_result(df, name, export_ts, label="📥 Download"):
+    """Download ``df`` in the picked format; only that format gets encoded."""
+    fmt = st.radio(
+        "Download format", DOWNLOAD_FORMATS, horizontal=True,
+        key=f"{name}_format", label_visibility="collapsed"
+    )
+    if fmt == "Parquet":
+        st.download_button(
+            label, _parquet_bytes(df), f"{name}_{export_ts}.parquet",
+            mime="application/octet-stream", key=f"{name}_download"
+        )
+    else:
+        st.download_button(
+            label, _csv_bytes(df), f"{name}_{export_ts}.csv",
+            mime="text/csv", key=f"{name}_download"
+        )
+
+def shrink(df):
+    """Store repetitive text as categories and ints in the narrowest type before keeping ``df``."""
+    for col in df.select_dtypes('object'):
+        values = df[col]
+        # Mixed columns like DQ "Actual" stay object so _parquet_ready can still stringify them
+        if pd.api.types.infer_dtype(values, skipna=True) == 'string' and values.nunique() < 0.5 * len(df):
+            df[col] = values.astype('category')
+    for col in df.select_dtypes('integer'):
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+# Each user's last results are kept on disk so a browser refresh doesn't lose them
+RESULT_CACHE_DIR = ".cache"
+PERSISTED_RESULTS = ('test_results', 'dq_summary', 'dq_details')
+
+def _result_cache_path(pool_key, name):
+    digest = hashlib.sha256(pool_key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(RESULT_CACHE_DIR, f"{digest}_{name}.parquet")
+
+def persist_result(pool_key, name, df):
+    try:
+        os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+        _parquet_ready(df).to_parquet(_result_cache_path(pool_key, name), compression='snappy', index=False)
+    except Exception as e:
+        logging.warning(f"Could not persist {name}: {str(e)}")
+
+def restore_results(pool_key):
+    for name in PERSISTED_RESULTS:
+        path = _result_cache_path(pool_key, name)
+        if st.session_state[name] is None and os.path.exists(path):
+            try:
+                st.session_state[name] = pd.read_parquet(path)
+            except Exception as e:
+                logging.warning(f"Could not restore {name}: {str(e)}")
+    
+    details = st.session_state.dq_details
+    if st.session_state.dq_score is None and st.session_state.dq_summary is not None and details is not None:
+        # Same score DataQualityValidator.run_checks reported for these details
+        st.session_state.dq_score = (details['Status'] == "✅ Pass").mean() * 100 if not details.empty else 0
+        st.session_state.dq_score_class = score_class(st.session_state.dq_score)
+
+def paginated_dataframe(df, key, page_size=DISPLAY_PAGE_SIZE):
+    """Send one page of ``df`` to the browser; the full frame stays server-side."""
+    if len(df) <= page_size:
+        st.dataframe(df, use_container_width=True, key=f"{key}_df")
+        return
+    
+    size_col, page_col = st.columns(2)
+    page_size = size_col.selectbox(
+        "Rows per page", DISPLAY_PAGE_SIZES,
+        index=DISPLAY_PAGE_SIZES.index(page_size) if page_size in DISPLAY_PAGE_SIZES else 0,
+        key=f"{key}_page_size"
+    )
+    pages = max(1, -(-len(df) // page_size))
+    page_key = f"{key}_page"
+    # A new, shorter result (or a bigger page size) must not leave the pager
+    # past its last page
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = page_col.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key)
+    start = (page - 1) * page_size
+    st.dataframe(df.iloc[start:start + page_size], use_container_width=True, key=f"{key}_df")
+    st.caption(f"Rows {start + 1}–{min(start + page_size, len(df))} of {len(df)}")
+
+@st.cache_resource(show_spinner=False)
+def _pyplot():
+    # matplotlib is slow to import; only the DQ chart needs it, so load it on first use
+    import matplotlib
+    # Charts are only ever rendered to PNG, so skip GUI backend detection
+    matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+    return plt
+
+@st.cache_data(show_spinner=False)
+def _dq_chart_png(pass_count, fail_count):
+    # The chart only depends on two counts; draw it once per pair, not per rerun
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.bar(['Passed', 'Failed'], [pass_count, fail_count], color=['green', 'red'])
+    ax.set_ylabel('Number of Checks')
+    ax.set_title('Data Quality Check Results')
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=90, bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+def _seed_selection(key, options, last_key):
+    """Open a not-yet-rendered selectbox on the value last picked in any tab."""
+    last = st.session_state.get(last_key)
+    if key not in st.session_state and last in options:
+        st.session_state[key] = last
+
+@st.fragment
+def render_schema_results(export_ts):
+    if st.session_state.table_diff is None:
+        st.info("Run validation to see results")
+        return
+    
+    sub_tab1, sub_tab2, sub_tab3 = st.tabs(["Tables", "Columns", "Data Types"])
+    
+    with sub_tab1:
+        if not st.session_state.table_diff.empty:
+            paginated_dataframe(st.session_state.table_diff, key="table_diff")
+            download_result(st.session_state.table_diff, "table_diff", export_ts)
+        else:
+            st.info("No differences found")
+    
+    with sub_tab2:
+        if not st.session_state.col_diff.empty:
+            paginated_dataframe(st.session_state.col_diff, key="col_diff")
+            download_result(st.session_state.col_diff, "col_diff", export_ts)
+        else:
+            st.info("No differences found")
+    
+    with sub_tab3:
+        if not st.session_state.type_diff.empty:
+            paginated_dataframe(st.session_state.type_diff, key="type_diff")
+            download_result(st.session_state.type_diff, "type_diff", export_ts)
+        else:
+            st.info("No differences found")
+
+@st.fragment
+def render_kpi_results(export_ts):
+    results = st.session_state.kpi_results
+    if results is None or results.empty:
+        st.info("Run validation to see results")
+        return
+    
+    paginated_dataframe(results, key="kpi_results")
+    download_result(results, "kpi_results", export_ts)
+
+@st.fragment
+def render_test_results(export_ts):
+    results = st.session_state.test_results
+    if results is None or results.empty:
+        st.info("Run validation to see results")
+        return
+    
+    paginated_dataframe(results, key="test_results")
+    
+    # Show pass/fail summary; Status only ever holds these three values,
+    # so one tally covers all of them
+    status_counts = results['Status'].value_counts()
+    
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("✅ Passed", status_counts.get("✅ PASS", 0))
+    col_b.metric("❌ Failed", status_counts.get("❌ FAIL", 0))
+    col_c.metric("⚠️ Errors", status_counts.get("❌ ERROR", 0))
+    
+    download_result(results, "test_results", export_ts)
+
+@st.fragment
+def render_dq_results(export_ts):
+    # Score, summary and details are always stored together by a run
+    if st.session_state.dq_score is None:
+        st.info("Run checks to see results")
+        return
+    
+    st.markdown(
+        f'<div class="score-box {st.session_state.dq_score_class}">'
+        f'Quality Score: {st.session_state.dq_score:.0f}/100</div>',
+        unsafe_allow_html=True
+    )
+    
+    summary = st.session_state.dq_summary
+    details = st.session_state.dq_details
+    sub_tab1, sub_tab2 = st.tabs(["Summary", "Details"])
+    
+    with sub_tab1:
+        if not summary.empty:
+            st.dataframe(summary, use_container_width=True)
+            
+            # Create visualization
+            if not details.empty:
+                status_counts = details['Status'].value_counts()
+                pass_count = int(status_counts.get("✅ Pass", 0))
+                fail_count = int(status_counts.get("❌ Fail", 0))
+                
+                if pass_count + fail_count > 0:
+                    st.image(_dq_chart_png(pass_count, fail_count))
+        else:
+            st.info("Run checks to see summary")
+    
+    with sub_tab2:
+        if not details.empty:
+            paginated_dataframe(details, key="dq_details")
+            
+            download_result(details, "dq_report", export_ts, label="📥 Download Report")
+        else:
+            st.info("Run checks to see details")
+
+def render_schema_validation(databases, export_ts):
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.subheader("📋 Configuration")
+        _seed_selection("schema_db", databases, 'last_db')
+        val_db = st.selectbox("Database", databases, key="schema_db")
+        st.session_state.last_db = val_db
+        
+        if val_db:
+            schemas = get_schemas(st.session_state.pool, val_db)
+            if len(schemas) >= 2:
+                _seed_selection("schema_source", schemas, 'last_schema')
+                val_source = st.selectbox("Source Schema", schemas, key="schema_source")
+                st.session_state.last_schema = val_source
+                val_target = st.selectbox("Target Schema", schemas, index=1, key="schema_target")
+                
+                if st.button("Execute DriftWatch", type="primary", use_container_width=True):
+                    with st.spinner("Validating..."):
+                        table_diff, col_diff, type_diff = compare_schemas(
+                            st.session_state.pool, val_db, val_source, val_target
+                        )
+                        
+                        st.session_state.table_diff = shrink(table_diff)
+                        st.session_state.col_diff = shrink(col_diff)
+                        st.session_state.type_diff = shrink(type_diff)
+                        st.success("✅ Validation completed!")
+            else:
+                st.warning("Need at least 2 schemas")
+    
+    with col2:
+        st.subheader("📊 Results")
+        render_schema_results(export_ts)
+
+def render_kpi_validation(databases, export_ts):
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.subheader("📋 Configuration")
+        _seed_selection("kpi_db", databases, 'last_db')
+        kpi_db = st.selectbox("Database", databases, key="kpi_db")
+        st.session_state.last_db = kpi_db
+        
+        if kpi_db:
+            schemas = get_schemas(st.session_state.pool, kpi_db)
+            if len(schemas) >= 2:
+                _seed_selection("kpi_source", schemas, 'last_schema')
+                kpi_source = st.selectbox("Source Schema", schemas, key="kpi_source")
+                st.session_state.last_schema = kpi_source
+                kpi_target = st.selectbox("Target Schema", schemas, index=1, key="kpi_target")
+                
+                if st.button("Execute DriftWatch", type="primary", use_container_width=True):
+                    with st.spinner("Validating KPIs..."):
+                        df, msg = validate_kpis(st.session_state.pool, kpi_db, kpi_source, kpi_target)
+                        st.session_state.kpi_results = shrink(df)
+                        
+                        if not df.empty:
+                            st.success(msg)
+                        else:
+                            st.warning(msg)
+            else:
+                st.warning("Need at least 2 schemas")
+    
+    with col2:
+        st.subheader("📊 Results")
+        render_kpi_results(export_ts)
+
+def render_test_case_validation(databases, export_ts):
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.subheader("📋 Configuration")
+        _seed_selection("tc_db", databases, 'last_db')
+        tc_db = st.selectbox("Database", databases, key="tc_db")
+        st.session_state.last_db = tc_db
+        
+        if tc_db:
+            schemas = get_schemas(st.session_state.pool, tc_db)
+            _seed_selection("tc_schema", schemas, 'last_schema')
+            tc_schema = st.selectbox("Schema", schemas, key="tc_schema")
+            st.session_state.last_schema = tc_schema
+            
+            if tc_schema:
+                tc_source = (tc_db, tc_schema)
+                reload_cases = st.button("🔄 Reload Test Cases", key="tc_reload")
+                if reload_cases or st.session_state.get('tc_source') != tc_source:
+                    st.session_state.tc_df = load_test_cases(st.session_state.pool, tc_db, tc_schema)
+                    st.session_state.tc_source = tc_source
+                tc_df = st.session_state.tc_df
+                
+                tables = ["All"] + sorted(tc_df['TABLE_NAME'].dropna().unique())
+                tc_table = st.selectbox("Category", tables, key="tc_table")
+                
+                if tc_table != "All":
+                    tc_df = tc_df[tc_df['TABLE_NAME'] == tc_table]
+                test_cases = list(tc_df.itertuples(index=False, name=None))
+                
+                if test_cases:
+                    st.subheader("Select Test Cases")
+                    test_names = [f"{case[1]}" for case in test_cases]
+                    
+                    select_all = st.checkbox("Select All", value=True, key="tc_select_all")
+                    
+                    if select_all:
+                        selected = st.multiselect(
+                            "Test Cases",
+                            test_names,
+                            default=test_names,
+                            key="tc_selected"
+                        )
+                    else:
+                        selected = st.multiselect(
+                            "Test Cases",
+                            test_names,
+                            key="tc_selected_manual"
+                        )
+                    
+                    force_rerun = st.checkbox(
+                        "Force re-run", key="tc_force_rerun",
+                        help="Ignore results cached from an identical run in the last 10 minutes"
+                    )
+                    
+                    if st.button("Execute DriftWatch", type="primary", use_container_width=True):
+                        if selected:
+                            with st.spinner("Running tests..."):
+                                selected_names = set(selected)
+                                selected_cases = tuple(case for case in test_cases if case[1] in selected_names)
+                                if force_rerun:
+                                    _cached_validate_test_cases.clear()
+                                df, msg = _cached_validate_test_cases(
+                                    st.session_state.pool, st.session_state.pool.key,
+                                    tc_db, tc_schema, selected_cases
+                                )
+                                st.session_state.test_results = shrink(df)
+                                persist_result(st.session_state.pool.key, 'test_results', df)
+                                
+                                if not df.empty:
+                                    st.success(msg)
+                                else:
+                                    st.warning(msg)
+                        else:
+                            st.warning("Select at least one test case")
+                else:
+                    st.warning("No test cases found")
+    
+    with col2:
+        st.subheader("📊 Results")
+        render_test_results(export_ts)
+
+def render_dq_validation(databases, export_ts):
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.subheader("📋 Configuration")
+        _seed_selection("dq_db", databases, 'last_db')
+        dq_db = st.selectbox("Database", databases, key="dq_db")
+        st.session_state.last_db = dq_db
+        
+        if dq_db:
+            schemas = get_schemas(st.session_state.pool, dq_db)
+            _seed_selection("dq_schema", schemas, 'last_schema')
+            dq_schema = st.selectbox("Schema", schemas, key="dq_schema")
+            st.session_state.last_schema = dq_schema
+            
+            if dq_schema:
+                tables = get_tables(st.session_state.pool, dq_db, dq_schema)
+                dq_table = st.selectbox("Table", tables, key="dq_table")
+                
+                if dq_table:
+                    st.subheader("Quality Checks")
+                    
+                    dq_row_count = st.checkbox("Row Count Check", value=True, key="dq_row")
+                    if dq_row_count:
+                        dq_min_rows = st.number_input("Minimum Rows", value=1, min_value=0, key="dq_min")
+                        dq_exact_count = st.checkbox(
+                            "Exact row count", value=False, key="dq_exact_count",
+                            help="Run COUNT(*) instead of reading the row count from table metadata."
+                        )
+                    else:
+                        dq_min_rows = 1
+                        dq_exact_count = False
+                    
+                    dq_duplicates = st.checkbox("Duplicate Rows Check", value=True, key="dq_dup")
+                    if dq_duplicates:
+                        dq_dup_mode = st.selectbox(
+                            "Duplicate method", list(DUPLICATE_MODES), key="dq_dup_mode",
+                            format_func=DUPLICATE_MODES.get,
+                            help="Approximate uses a HyperLogLog estimate; exact groups by every column and is slowest on large tables."
+                        )
+                    else:
+                        dq_dup_mode = "hash"
+                    
+                    dq_force = st.checkbox(
+                        "Force re-run", key="dq_force_rerun",
+                        help="Ignore results cached from identical checks in the last 2 minutes"
+                    )
+                    
+                    st.markdown("<br>", unsafe_allow_html=True)
+                    
+                    if st.button("Run Quality Checks", type="primary", use_container_width=True):
+                        with st.spinner("Running checks..."):
+                            pool = st.session_state.pool
+                            if dq_force:
+                                _cached_run_checks.clear()
+                            summary, details, score = _cached_run_checks(
+                                get_validator(pool, pool.key), pool.key,
+                                dq_db, dq_schema, dq_table,
+                                dq_row_count, dq_min_rows, dq_duplicates, dq_dup_mode,
+                                dq_exact_count
+                            )
+                            
+                            st.session_state.dq_summary = shrink(summary)
+                            st.session_state.dq_details = shrink(details)
+                            st.session_state.dq_score = score
+                            st.session_state.dq_score_class = score_class(score)
+                            persist_result(pool.key, 'dq_summary', summary)
+                            persist_result(pool.key, 'dq_details', details)
+                            st.success("✅ Quality checks completed!")
+    
+    with col2:
+        st.subheader("📊 Results")
+        render_dq_results(export_ts)
+
+# Each DriftWatch validation type and the function that renders its tab
+VALIDATION_VIEWS = {
+    "Schema Validation": render_schema_validation,
+    "KPI Validation": render_kpi_validation,
+    "Test Case Validation": render_test_case_validation,
+    "Data Quality Validation": render_dq_validation,
+}
+
 def show_main_app():
+    # Fetched once per rerun and shared by the sidebar and every tab
+    databases = get_databases(st.session_state.pool)
+    # Timestamp stamped on every download filename rendered in this run
+    export_ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    if not st.session_state.results_restored:
+        restore_results(st.session_state.pool.key)
+        st.session_state.results_restored = True
+    
     st.markdown(f"""
     <div class="main-header">
         <h1>🔧 DeploySure Suite</h1>
@@ -550,18 +1458,21 @@ def show_main_app():
         st.success(f"✅ **{st.session_state.username}**")
         
         if st.button("🔓 Disconnect", use_container_width=True):
-            if st.session_state.conn:
-                st.session_state.conn.close()
-            st.session_state.conn = None
+            # The pool is a shared cached resource, so it isn't evicted; just
+            # end its idle keep-alive sessions and drop our handle
+            st.session_state.pool.close()
+            st.session_state.pool = None
             st.session_state.is_logged_in = False
+            st.session_state.results_restored = False
+            st.rerun()
+        
+        if st.button("🔄 Refresh metadata", use_container_width=True):
+            # Pick up objects created outside the app before the TTL runs out
+            _fetch_metadata.clear()
             st.rerun()
         
         st.markdown("---")
-        try:
-            dbs = get_databases(st.session_state.conn)
-            st.metric("Databases", len(dbs))
-        except:
-            pass
+        st.metric("Databases", len(databases))
     
     # Main tabs
     tab1, tab2 = st.tabs(["⎘ MirrorSchema", "🔍 DriftWatch"])
@@ -574,24 +1485,27 @@ def show_main_app():
         with col1:
             st.subheader("📋 Configuration")
             
-            databases = get_databases(st.session_state.conn)
             if not databases:
                 st.warning("No databases found")
                 return
             
-            source_db = st.selectbox("Source Database", databases)
+            _seed_selection("mirror_db", databases, 'last_db')
+            source_db = st.selectbox("Source Database", databases, key="mirror_db")
+            st.session_state.last_db = source_db
             
             if source_db:
-                schemas = get_schemas(st.session_state.conn, source_db)
+                schemas = get_schemas(st.session_state.pool, source_db)
                 if schemas:
-                    source_schema = st.selectbox("Source Schema", schemas)
+                    _seed_selection("mirror_schema", schemas, 'last_schema')
+                    source_schema = st.selectbox("Source Schema", schemas, key="mirror_schema")
+                    st.session_state.last_schema = source_schema
                     target_schema = st.text_input("Target Schema", value=f"{source_schema}_CLONE")
                     
                     if st.button("🚀 Execute MirrorSchema", type="primary", use_container_width=True):
                         if target_schema:
                             with st.spinner("Mirroring..."):
                                 success, msg, df = clone_schema(
-                                    st.session_state.conn, source_db, source_schema, target_schema
+                                    st.session_state.pool, source_db, source_schema, target_schema
                                 )
                                 
                                 if success:
@@ -618,280 +1532,11 @@ def show_main_app():
     with tab2:
         st.header("DriftWatch")
         
-        validation_type = st.selectbox(
-            "Validation Type",
-            ["Schema Validation", "KPI Validation", "Test Case Validation", "Data Quality Validation"]
-        )
+        validation_type = st.selectbox("Validation Type", list(VALIDATION_VIEWS))
         
         st.markdown("---")
         
-        # === SCHEMA VALIDATION ===
-        if validation_type == "Schema Validation":
-            col1, col2 = st.columns([1, 2])
-            
-            with col1:
-                st.subheader("📋 Configuration")
-                databases = get_databases(st.session_state.conn)
-                val_db = st.selectbox("Database", databases, key="schema_db")
-                
-                if val_db:
-                    schemas = get_schemas(st.session_state.conn, val_db)
-                    if len(schemas) >= 2:
-                        val_source = st.selectbox("Source Schema", schemas, key="schema_source")
-                        val_target = st.selectbox("Target Schema", schemas, index=1, key="schema_target")
-                        
-                        if st.button("Execute DriftWatch", type="primary", use_container_width=True):
-                            with st.spinner("Validating..."):
-                                table_diff = compare_table_differences(st.session_state.conn, val_db, val_source, val_target)
-                                col_diff, type_diff = compare_column_differences(st.session_state.conn, val_db, val_source, val_target)
-                                
-                                st.session_state.table_diff = table_diff
-                                st.session_state.col_diff = col_diff
-                                st.session_state.type_diff = type_diff
-                                st.success("✅ Validation completed!")
-                    else:
-                        st.warning("Need at least 2 schemas")
-            
-            with col2:
-                st.subheader("📊 Results")
-                
-                sub_tab1, sub_tab2, sub_tab3 = st.tabs(["Tables", "Columns", "Data Types"])
-                
-                with sub_tab1:
-                    if 'table_diff' in st.session_state and not st.session_state.table_diff.empty:
-                        st.dataframe(st.session_state.table_diff, use_container_width=True)
-                        csv = st.session_state.table_diff.to_csv(index=False)
-                        st.download_button("📥 Download", csv, f"table_diff_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-                    else:
-                        st.info("No differences found")
-                
-                with sub_tab2:
-                    if 'col_diff' in st.session_state and not st.session_state.col_diff.empty:
-                        st.dataframe(st.session_state.col_diff, use_container_width=True)
-                        csv = st.session_state.col_diff.to_csv(index=False)
-                        st.download_button("📥 Download", csv, f"col_diff_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-                    else:
-                        st.info("No differences found")
-                
-                with sub_tab3:
-                    if 'type_diff' in st.session_state and not st.session_state.type_diff.empty:
-                        st.dataframe(st.session_state.type_diff, use_container_width=True)
-                        csv = st.session_state.type_diff.to_csv(index=False)
-                        st.download_button("📥 Download", csv, f"type_diff_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-                    else:
-                        st.info("No differences found")
-        
-        # === KPI VALIDATION ===
-        elif validation_type == "KPI Validation":
-            col1, col2 = st.columns([1, 2])
-            
-            with col1:
-                st.subheader("📋 Configuration")
-                databases = get_databases(st.session_state.conn)
-                kpi_db = st.selectbox("Database", databases, key="kpi_db")
-                
-                if kpi_db:
-                    schemas = get_schemas(st.session_state.conn, kpi_db)
-                    if len(schemas) >= 2:
-                        kpi_source = st.selectbox("Source Schema", schemas, key="kpi_source")
-                        kpi_target = st.selectbox("Target Schema", schemas, index=1, key="kpi_target")
-                        
-                        if st.button("Execute DriftWatch", type="primary", use_container_width=True):
-                            with st.spinner("Validating KPIs..."):
-                                df, msg = validate_kpis(st.session_state.conn, kpi_db, kpi_source, kpi_target)
-                                st.session_state.kpi_results = df
-                                
-                                if not df.empty:
-                                    st.success(msg)
-                                else:
-                                    st.warning(msg)
-                    else:
-                        st.warning("Need at least 2 schemas")
-            
-            with col2:
-                st.subheader("📊 Results")
-                if 'kpi_results' in st.session_state and not st.session_state.kpi_results.empty:
-                    st.dataframe(st.session_state.kpi_results, use_container_width=True)
-                    csv = st.session_state.kpi_results.to_csv(index=False)
-                    st.download_button("📥 Download", csv, f"kpi_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-                else:
-                    st.info("Run validation to see results")
-        
-        # === TEST CASE VALIDATION ===
-        elif validation_type == "Test Case Validation":
-            col1, col2 = st.columns([1, 2])
-            
-            with col1:
-                st.subheader("📋 Configuration")
-                databases = get_databases(st.session_state.conn)
-                tc_db = st.selectbox("Database", databases, key="tc_db")
-                
-                if tc_db:
-                    schemas = get_schemas(st.session_state.conn, tc_db)
-                    tc_schema = st.selectbox("Schema", schemas, key="tc_schema")
-                    
-                    if tc_schema:
-                        tables = get_test_case_tables(st.session_state.conn, tc_db, tc_schema)
-                        tc_table = st.selectbox("Category", tables, key="tc_table")
-                        
-                        test_cases = get_test_cases(st.session_state.conn, tc_db, tc_schema, tc_table)
-                        
-                        if test_cases:
-                            st.subheader("Select Test Cases")
-                            test_names = [f"{case[1]}" for case in test_cases]
-                            
-                            select_all = st.checkbox("Select All", value=True, key="tc_select_all")
-                            
-                            if select_all:
-                                selected = st.multiselect(
-                                    "Test Cases",
-                                    test_names,
-                                    default=test_names,
-                                    key="tc_selected"
-                                )
-                            else:
-                                selected = st.multiselect(
-                                    "Test Cases",
-                                    test_names,
-                                    key="tc_selected_manual"
-                                )
-                            
-                            if st.button("Execute DriftWatch", type="primary", use_container_width=True):
-                                if selected:
-                                    with st.spinner("Running tests..."):
-                                        selected_cases = [case for case in test_cases if case[1] in selected]
-                                        df, msg = validate_test_cases(
-                                            st.session_state.conn, tc_db, tc_schema, selected_cases
-                                        )
-                                        st.session_state.test_results = df
-                                        
-                                        if not df.empty:
-                                            st.success(msg)
-                                        else:
-                                            st.warning(msg)
-                                else:
-                                    st.warning("Select at least one test case")
-                        else:
-                            st.warning("No test cases found")
-            
-            with col2:
-                st.subheader("📊 Results")
-                if 'test_results' in st.session_state and not st.session_state.test_results.empty:
-                    st.dataframe(st.session_state.test_results, use_container_width=True)
-                    
-                    # Show pass/fail summary
-                    pass_count = len(st.session_state.test_results[st.session_state.test_results['Status'].str.contains('PASS')])
-                    fail_count = len(st.session_state.test_results[st.session_state.test_results['Status'].str.contains('FAIL')])
-                    error_count = len(st.session_state.test_results[st.session_state.test_results['Status'].str.contains('ERROR')])
-                    
-                    col_a, col_b, col_c = st.columns(3)
-                    col_a.metric("✅ Passed", pass_count)
-                    col_b.metric("❌ Failed", fail_count)
-                    col_c.metric("⚠️ Errors", error_count)
-                    
-                    csv = st.session_state.test_results.to_csv(index=False)
-                    st.download_button(
-                        "📥 Download",
-                        csv,
-                        f"test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                    )
-                else:
-                    st.info("Run validation to see results")
-        
-        # === DATA QUALITY VALIDATION ===
-        elif validation_type == "Data Quality Validation":
-            col1, col2 = st.columns([1, 2])
-            
-            with col1:
-                st.subheader("📋 Configuration")
-                databases = get_databases(st.session_state.conn)
-                dq_db = st.selectbox("Database", databases, key="dq_db")
-                
-                if dq_db:
-                    schemas = get_schemas(st.session_state.conn, dq_db)
-                    dq_schema = st.selectbox("Schema", schemas, key="dq_schema")
-                    
-                    if dq_schema:
-                        tables = get_tables(st.session_state.conn, dq_db, dq_schema)
-                        dq_table = st.selectbox("Table", tables, key="dq_table")
-                        
-                        if dq_table:
-                            st.subheader("Quality Checks")
-                            
-                            dq_row_count = st.checkbox("Row Count Check", value=True, key="dq_row")
-                            if dq_row_count:
-                                dq_min_rows = st.number_input("Minimum Rows", value=1, min_value=0, key="dq_min")
-                            else:
-                                dq_min_rows = 1
-                            
-                            dq_duplicates = st.checkbox("Duplicate Rows Check", value=True, key="dq_dup")
-                            
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            
-                            if st.button("Run Quality Checks", type="primary", use_container_width=True):
-                                with st.spinner("Running checks..."):
-                                    validator = DataQualityValidator(st.session_state.conn)
-                                    summary, details, score = validator.run_checks(
-                                        dq_db, dq_schema, dq_table,
-                                        dq_row_count, dq_min_rows, dq_duplicates
-                                    )
-                                    
-                                    st.session_state.dq_summary = summary
-                                    st.session_state.dq_details = details
-                                    st.session_state.dq_score = score
-                                    st.success("✅ Quality checks completed!")
-            
-            with col2:
-                st.subheader("📊 Results")
-                
-                if 'dq_score' in st.session_state:
-                    score = st.session_state.dq_score
-                    
-                    if score >= 80:
-                        score_class = "passed-score"
-                    elif score >= 50:
-                        score_class = "warning-score"
-                    else:
-                        score_class = "failed-score"
-                    
-                    st.markdown(
-                        f'<div class="score-box {score_class}">Quality Score: {score:.0f}/100</div>',
-                        unsafe_allow_html=True
-                    )
-                
-                sub_tab1, sub_tab2 = st.tabs(["Summary", "Details"])
-                
-                with sub_tab1:
-                    if 'dq_summary' in st.session_state and not st.session_state.dq_summary.empty:
-                        st.dataframe(st.session_state.dq_summary, use_container_width=True)
-                        
-                        # Create visualization
-                        if 'dq_details' in st.session_state and not st.session_state.dq_details.empty:
-                            details = st.session_state.dq_details
-                            pass_count = len(details[details['Status'].str.contains('Pass')])
-                            fail_count = len(details[details['Status'].str.contains('Fail')])
-                            
-                            if pass_count + fail_count > 0:
-                                fig, ax = plt.subplots(figsize=(8, 4))
-                                ax.bar(['Passed', 'Failed'], [pass_count, fail_count], color=['green', 'red'])
-                                ax.set_ylabel('Number of Checks')
-                                ax.set_title('Data Quality Check Results')
-                                st.pyplot(fig)
-                    else:
-                        st.info("Run checks to see summary")
-                
-                with sub_tab2:
-                    if 'dq_details' in st.session_state and not st.session_state.dq_details.empty:
-                        st.dataframe(st.session_state.dq_details, use_container_width=True)
-                        
-                        csv = st.session_state.dq_details.to_csv(index=False)
-                        st.download_button(
-                            "📥 Download Report",
-                            csv,
-                            f"dq_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                        )
-                    else:
-                        st.info("Run checks to see details")
+        VALIDATION_VIEWS[validation_type](databases, export_ts)
 
 # ========== MAIN EXECUTION ==========
 if st.session_state.is_logged_in: